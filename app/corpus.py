@@ -0,0 +1,236 @@
+"""Preloaded corpus of every Andoku difficulty file, held in flat NumPy arrays."""
+import os
+import shutil
+import tempfile
+import typing
+
+import numpy as np
+
+from app.decode_sudoku import Difficulty, load_file
+from app.givens import GivensMask
+
+CELLS = 81
+FILE_PATTERN = "std_n_{num}.adkb"
+ARRAY_NAMES = ("solutions", "givens", "difficulties", "puzzles")
+
+
+class Corpus:
+    """All puzzles of a set of difficulties, stored row-wise in contiguous arrays.
+
+    `solutions` is an (N, 81) int8 array of solved values, `givens` an (N, 81) bool array that is True for the
+    cells shown in the unsolved puzzle and `difficulties` an (N,) int8 array of `Difficulty` values. Puzzles of one
+    difficulty occupy consecutive rows, in file order. `puzzles` is the read-only (N, 81) int8 array of unsolved
+    puzzles, with 0 for the unknown cells.
+
+    The unsolved puzzles are exposed without copying through `__array_interface__`, so `np.asarray(corpus)` and
+    pandas see them directly, through the buffer protocol with `memoryview` and as Arrow arrays with `to_arrow`.
+
+    """
+
+    def __init__(self, solutions, givens, difficulties, puzzles):
+        """Initialize."""
+        self.solutions = solutions
+        self.givens = givens
+        self.difficulties = difficulties
+        # A view, so that marking it read-only leaves the caller's array alone.
+        self.puzzles = puzzles.view()
+        self.puzzles.flags.writeable = False
+        self.offsets: typing.Dict[Difficulty, typing.Tuple[int, int]] = dict()
+        for difficulty in Difficulty:
+            rows = np.flatnonzero(difficulties == difficulty.value)
+            if len(rows):
+                self.offsets[difficulty] = (int(rows[0]), int(rows[-1]) + 1)
+
+    def __len__(self):
+        """Return the total number of puzzles."""
+        return len(self.difficulties)
+
+    @property
+    def __array_interface__(self):
+        """Describe the unsolved puzzles to NumPy, which then uses their memory instead of copying it."""
+        return self.puzzles.__array_interface__
+
+    def __buffer__(self, flags):
+        """Expose the unsolved puzzles through the buffer protocol, on Pythons that support it from Python."""
+        return memoryview(self.puzzles)
+
+    def memoryview(self, solved: bool = False) -> memoryview:
+        """Return a read-only (N, 81) memoryview of the unsolved puzzles, or of the solutions if `solved` is set."""
+        rows = (self.solutions if solved else self.puzzles).view()
+        rows.flags.writeable = False
+        return memoryview(rows)
+
+    def to_arrow(self, solved: bool = False, binary: bool = False):
+        """Return the unsolved puzzles, or the solutions, as an Arrow array sharing their memory.
+
+        Each puzzle is a row of 81 int8 cell values, as a FixedSizeList<int8>[81] array or, with `binary`, a
+        FixedSizeBinary(81) array. Requires pyarrow.
+
+        """
+        pa = _pyarrow()
+        rows = np.ascontiguousarray(self.solutions if solved else self.puzzles)
+        data = pa.py_buffer(rows)
+        if binary:
+            return pa.Array.from_buffers(pa.binary(CELLS), len(rows), [None, data])
+        values = pa.Array.from_buffers(pa.int8(), rows.size, [None, data])
+        return pa.FixedSizeListArray.from_arrays(values, CELLS)
+
+    @classmethod
+    def from_files(cls, path="files/", difficulties: typing.Optional[typing.Iterable[Difficulty]] = None):
+        """Decode the .adkb files found in `path`, by default one for every difficulty."""
+        solutions = list()
+        masks = list()
+        levels = list()
+        for difficulty in difficulties or Difficulty:
+            puzzles = load_file(os.path.join(path, FILE_PATTERN.format(num=difficulty.value)), load_as_solved=True)
+            for p in puzzles:
+                solutions.append(p.puzzle.reshape(CELLS))
+                masks.append(p.bin_to_remove)
+            levels.extend([difficulty.value] * len(puzzles))
+        solutions = np.array(solutions, dtype=np.int8)
+        givens = GivensMask.from_bytes(masks).to_bool()
+        puzzles = np.where(givens, solutions, 0).astype(np.int8)
+        return cls(solutions=solutions, givens=givens, difficulties=np.array(levels, dtype=np.int8), puzzles=puzzles)
+
+    @classmethod
+    def load(cls, directory, mmap: bool = True):
+        """Load a corpus written by `save`.
+
+        With `mmap=True` the arrays are memory-mapped read-only, so every process loading the same directory shares
+        one copy of the data through the page cache.
+
+        """
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode) for name in ARRAY_NAMES}
+        return cls(**arrays)
+
+    def save(self, directory):
+        """Write the corpus arrays as .npy files into `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, name + ".npy"), np.ascontiguousarray(getattr(self, name)))
+
+    def count(self, difficulty: Difficulty) -> int:
+        """Return the number of puzzles of a difficulty."""
+        start, stop = self.offsets.get(difficulty, (0, 0))
+        return stop - start
+
+    def row(self, difficulty: Difficulty, index: int) -> int:
+        """Return the corpus row of puzzle `index` within `difficulty`, raising IndexError if there is none."""
+        if not 0 <= index < self.count(difficulty):
+            raise IndexError(f"No puzzle {index} for difficulty {difficulty.name}")
+        return self.offsets[difficulty][0] + index
+
+    def random_index(self, difficulty: Difficulty, rng=None) -> int:
+        """Return a random puzzle index within `difficulty`."""
+        count = self.count(difficulty)
+        if count == 0:
+            raise IndexError(f"No puzzles for difficulty {difficulty.name}")
+        rng = rng or np.random.default_rng()
+        return int(rng.integers(count))
+
+    def puzzle(self, difficulty: Difficulty, index: int):
+        """Return the unsolved puzzle as an (81,) int8 array, with 0 for the unknown cells."""
+        return self.puzzles[self.row(difficulty, index)]
+
+    def solution(self, difficulty: Difficulty, index: int):
+        """Return the solved puzzle as an (81,) int8 array."""
+        return np.asarray(self.solutions[self.row(difficulty, index)])
+
+    def clues(self, difficulty: Difficulty, index: int) -> int:
+        """Return the number of givens in the unsolved puzzle."""
+        return int(np.count_nonzero(self.givens[self.row(difficulty, index)]))
+
+
+def load_corpus(path="files/", cache=None) -> Corpus:
+    """Return the corpus, memory-mapped from `cache` if given, building the cache on first use.
+
+    The cache is written to a temporary sibling directory and renamed into place, so the `cache` directory only
+    ever exists complete, and several processes starting together can race to build it safely. A cache missing any
+    of the arrays, such as one written before a new array was added, is rebuilt.
+
+    """
+    if cache is None:
+        return Corpus.from_files(path)
+    if not _cache_complete(cache):
+        cache = os.path.normpath(cache)
+        parent = os.path.dirname(os.path.abspath(cache))
+        staging = tempfile.mkdtemp(prefix=os.path.basename(cache) + ".", dir=parent)
+        stale = None
+        try:
+            Corpus.from_files(path).save(staging)
+            if os.path.isdir(cache) and not _cache_complete(cache):
+                # Move the outdated cache aside, as a directory cannot be renamed over a non-empty one.
+                stale = tempfile.mkdtemp(prefix=os.path.basename(cache) + ".", dir=parent)
+                os.rename(cache, os.path.join(stale, "cache"))
+            os.rename(staging, cache)
+        except OSError:
+            # Another process renamed its complete cache into place first.
+            if not _cache_complete(cache):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            if stale is not None:
+                shutil.rmtree(stale, ignore_errors=True)
+    return Corpus.load(cache, mmap=True)
+
+
+def _cache_complete(cache) -> bool:
+    return all(os.path.exists(os.path.join(cache, name + ".npy")) for name in ARRAY_NAMES)
+
+
+def rows_from_arrow(array):
+    """Return an (N, 81) int8 array over the memory of a `Corpus.to_arrow` style Arrow array, without copying."""
+    pa = _pyarrow()
+    if array.null_count:
+        raise ValueError("Puzzle rows cannot be null")
+    if pa.types.is_fixed_size_list(array.type):
+        if array.type.value_type != pa.int8() or array.type.list_size != CELLS:
+            raise TypeError(f"Expected rows of {CELLS} int8 values, got {array.type}")
+        array = array.flatten()
+        if array.null_count:
+            raise ValueError("Puzzle cells cannot be null")
+        start, stop = array.offset, array.offset + len(array)
+    elif pa.types.is_fixed_size_binary(array.type):
+        if array.type.byte_width != CELLS:
+            raise TypeError(f"Expected rows of {CELLS} bytes, got {array.type}")
+        start, stop = array.offset * CELLS, (array.offset + len(array)) * CELLS
+    else:
+        raise TypeError(f"Expected a FixedSizeList or FixedSizeBinary array, got {array.type}")
+    return np.frombuffer(array.buffers()[1], dtype=np.int8)[start:stop].reshape(-1, CELLS)
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow views of the corpus require pyarrow, install it with `pip install pyarrow`")
+    return pyarrow
+
+
+def to_flat(cells) -> str:
+    """Return the flat digit string of an (81,) array, as `Puzzle.flat_puzzle` does."""
+    return (np.asarray(cells, dtype=np.uint8) + ord("0")).tobytes().decode("ascii")
+
+
+def from_flat(board: str):
+    """Parse an 81 character board, where '0' or '.' mark unknown cells, into an (81,) int8 array."""
+    if len(board) != CELLS:
+        raise ValueError(f"A board has {CELLS} cells, got {len(board)}")
+    raw = np.frombuffer(board.replace(".", "0").encode("ascii"), dtype=np.uint8).astype(np.int8) - ord("0")
+    if ((raw < 0) | (raw > 9)).any():
+        raise ValueError("A board may only contain the digits 0-9 and '.'")
+    return raw
+
+
+def check_board(cells) -> typing.Tuple[bool, bool]:
+    """Return (valid, complete) for an (81,) array; valid means no digit repeats in a row, column or box."""
+    grid = np.asarray(cells).reshape(9, 9)
+    boxes = grid.reshape(3, 3, 3, 3).swapaxes(1, 2).reshape(9, 9)
+    units = np.concatenate([grid, grid.T, boxes])
+    # Count every digit per unit; index 0 collects the unknown cells and is ignored.
+    counts = np.zeros((27, 10), dtype=np.int8)
+    np.add.at(counts, (np.repeat(np.arange(27), 9), units.ravel()), 1)
+    valid = bool((counts[:, 1:] <= 1).all())
+    complete = bool((grid != 0).all())
+    return valid, complete
@@ -68,6 +68,62 @@ class CellValueGetter:
         return ret
 
 
+# sudokuwiki gives each digit a bit of its own, and all of them (511) for an unknown cell.
+SUDOKUWIKI_VALUES = {1: 1, 2: 2, 3: 4, 4: 8, 5: 16, 6: 32, 7: 64, 8: 128, 9: 256, 0: 511}
+
+
+def to_sudokuwiki(flat_puzzle: str) -> str:
+    """Return the sudokuwiki form of a flat puzzle."""
+    return ",".join([str(SUDOKUWIKI_VALUES[int(x)]) for x in flat_puzzle])
+
+
+def to_basicsudoku_symbols(flat_puzzle: str) -> str:
+    """Return the basicsudoku symbols of a flat puzzle."""
+    return "".join([x if 1 <= int(x) <= 9 else "." for x in flat_puzzle])
+
+
+def grade_sudokuwiki(board: str) -> typing.Tuple[str, int]:
+    """Get the difficulty that sudokuwiki gives a board in its sudokuwiki form."""
+    # Set up and make request to sudokuwiki for grading.
+    url = "https://www.sudokuwiki.org/ServerSolver.asp?k=0"
+    payload = {
+        "ff": "1",
+        "k": "0",
+        "gors": "1",
+        "coordmode": "1",
+        "mapno": "0",
+        "fullreport": "0",
+        "strat": "XWG",
+        "stratmask": "XWGSCNSFHXCYXYC3DMJFH",
+        "board": board,
+        "version": "2.08",
+    }
+    resp = requests.post(url, data=payload)
+    if not resp.ok:
+        return "The request to Sudokuwiki failed", 0
+
+    # Convert to lxml.html for more easily queryable structure.
+    content = lxml.html.fromstring(resp.content)
+
+    # Get values that we are interested in, grade text and grade value.
+    grade_text = content.xpath("//body/font/b/text()")
+    grade_value = content.xpath("//body/p[1]/text()")
+    grade_value_desc = "Overall Score: "
+
+    # Parse values
+    try:
+        assert grade_text
+        assert grade_value
+        grade_text = grade_text.pop()
+        grade_value = grade_value.pop()
+        assert grade_value_desc in grade_value
+        grade_value = grade_value.replace(grade_value_desc, "")
+        assert grade_value.isdigit()
+        return (grade_text, int(grade_value))
+    except Exception:
+        return "The output from Sudokuwiki was bad", 0
+
+
 class Puzzle:
     """Puzzle representation."""
 
@@ -95,16 +151,11 @@ class Puzzle:
 
     def remove_knowns(self):
         """Remove a set of known values to produce the unsolved Sudoku puzzle, based on self.bin_to_remove."""
-        checker = CellTypeChecker(self.bin_to_remove)
-        for i in range(self.x):
-            for i2 in range(self.x):
-                check = checker.check()
-                if check:
-                    pass
-                else:
-                    # this is incremented to 0 as the last part of the load step
-                    # but this needs to be differentiated here from regular 0s, so we set it to -1.
-                    self.puzzle[i][i2] = -1
+        # Bit set means keep, most significant bit first, in the order CellTypeChecker reads them.
+        bits = np.unpackbits(np.frombuffer(self.bin_to_remove, dtype=np.uint8), count=self.x * self.x)
+        # this is incremented to 0 as the last part of the load step
+        # but this needs to be differentiated here from regular 0s, so we set it to -1.
+        self.puzzle[bits.reshape(self.x, self.x) == 0] = -1
 
     @property
     def flat_puzzle(self):
@@ -118,9 +169,7 @@ class Puzzle:
     def sudokuwiki(self):
         """Returns the sudokuwiki form of the Sudoku."""
         if self.loaded:
-            d = {1: 1, 2: 2, 4: 3, 8: 4, 16: 5, 32: 6, 64: 7, 128: 8, 256: 9, 511: 0}
-            rev_d = {v: k for k, v in d.items()}
-            return ",".join([str(rev_d[int(x)]) for x in self.flat_puzzle])
+            return to_sudokuwiki(self.flat_puzzle)
         else:
             return None
 
@@ -130,51 +179,13 @@ class Puzzle:
         if self.loaded is False or self.solved is True:
             return "The provided Sudoku could not be graded", 0
 
-        # Set up and make request to sudokuwiki for grading.
-        url = "https://www.sudokuwiki.org/ServerSolver.asp?k=0"
-        payload = {
-            "ff": "1",
-            "k": "0",
-            "gors": "1",
-            "coordmode": "1",
-            "mapno": "0",
-            "fullreport": "0",
-            "strat": "XWG",
-            "stratmask": "XWGSCNSFHXCYXYC3DMJFH",
-            "board": self.sudokuwiki,
-            "version": "2.08",
-        }
-        resp = requests.post(url, data=payload)
-        if not resp.ok:
-            return "The request to Sudokuwiki failed", 0
-
-        # Convert to lxml.html for more easily queryable structure.
-        content = lxml.html.fromstring(resp.content)
-
-        # Get values that we are interested in, grade text and grade value.
-        grade_text = content.xpath("//body/font/b/text()")
-        grade_value = content.xpath("//body/p[1]/text()")
-        grade_value_desc = "Overall Score: "
-
-        # Parse values
-        try:
-            assert grade_text
-            assert grade_value
-            grade_text = grade_text.pop()
-            grade_value = grade_value.pop()
-            assert grade_value_desc in grade_value
-            grade_value = grade_value.replace(grade_value_desc, "")
-            assert grade_value.isdigit()
-            return (grade_text, int(grade_value))
-        except Exception:
-            return "The output from Sudokuwiki was bad", 0
+        return grade_sudokuwiki(self.sudokuwiki)
 
     @property
     def basicsudoku(self):
         """Returns the basicsudoku representation of the Sudoku."""
         if self.loaded:
-            symbols = "".join([x if 1 <= int(x) <= 9 else "." for x in self.flat_puzzle])
-            board = basicsudoku.SudokuBoard(symbols=symbols)
+            board = basicsudoku.SudokuBoard(symbols=to_basicsudoku_symbols(self.flat_puzzle))
             return board
         else:
             return None
@@ -227,10 +238,141 @@ class Puzzle:
         self.loaded = True
         self.solved = load_as_solved
 
+    def freeze(self):
+        """Return a read-only `FrozenPuzzle` copy of the loaded puzzle, or None if it is not loaded."""
+        if self.loaded:
+            return FrozenPuzzle(self.x, self.puzzle, self.solved, self.bin_values, self.bin_to_remove)
+        else:
+            return None
+
+
+class FrozenPuzzle:
+    """Read-only, loaded puzzle that can be shared between threads without locking or copying.
+
+    The puzzle array is not writeable, attributes cannot be reassigned, transforms return new objects and the
+    derived forms are computed at most once per instance.
+
+    """
+
+    __slots__ = ("x", "puzzle", "solved", "bin_values", "bin_to_remove", "_cache")
+
+    def __init__(self, x, puzzle, solved=False, bin_values=None, bin_to_remove=None):
+        """Initialize."""
+        # Backed by immutable bytes, so that the array cannot be made writeable again.
+        puzzle = np.frombuffer(np.ascontiguousarray(puzzle, dtype=np.int8).tobytes(), dtype=np.int8).reshape(x, x)
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "puzzle", puzzle)
+        object.__setattr__(self, "solved", solved)
+        object.__setattr__(self, "bin_values", bin_values)
+        object.__setattr__(self, "bin_to_remove", bin_to_remove)
+        object.__setattr__(self, "_cache", dict())
+
+    def __setattr__(self, name, value):
+        """Refuse to change the puzzle."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        """Refuse to change the puzzle."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __str__(self):
+        """Defines how to represent the Sudoku Puzzle as a str."""
+        return (
+            f"<FrozenPuzzle x={self.x} "
+            f"flat_puzzle={self.flat_puzzle} "
+            f"bin_values={self.bin_values} "
+            f"bin_to_remove={self.bin_to_remove}>"
+        )
+
+    def __repr__(self):
+        """Proxies to __str__."""
+        return str(self)
+
+    def __eq__(self, other):
+        """Return True if both are the same puzzle in the same state."""
+        if not isinstance(other, FrozenPuzzle):
+            return NotImplemented
+        return self.solved == other.solved and self.flat_puzzle == other.flat_puzzle
+
+    def __hash__(self):
+        """Hash by the puzzle values."""
+        return hash((self.solved, self.flat_puzzle))
+
+    def __copy__(self):
+        """Return self, as there is nothing that a copy could change."""
+        return self
+
+    def __deepcopy__(self, memo):
+        """Return self, as there is nothing that a copy could change."""
+        return self
+
+    def __reduce__(self):
+        """Pickle through the constructor, so that the unpickled puzzle is read-only too."""
+        return type(self), (self.x, self.puzzle, self.solved, self.bin_values, self.bin_to_remove)
+
+    def _cached(self, name, compute):
+        # Two threads may both compute a missing value, but they store equal results, so no lock is needed.
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache.setdefault(name, compute())
+        return value
+
+    @property
+    def loaded(self):
+        """Always True, a frozen puzzle is created from loaded values."""
+        return True
+
+    @property
+    def flat_puzzle(self):
+        """Return a flattened version of the Sudoku."""
+        return self._cached("flat_puzzle", lambda: "".join([str(x) for x in self.puzzle.flatten()]))
+
+    @property
+    def sudokuwiki(self):
+        """Returns the sudokuwiki form of the Sudoku."""
+        return self._cached("sudokuwiki", lambda: to_sudokuwiki(self.flat_puzzle))
+
+    @property
+    def basicsudoku_symbols(self):
+        """Returns the symbols of the basicsudoku representation of the Sudoku."""
+        return self._cached("basicsudoku_symbols", lambda: to_basicsudoku_symbols(self.flat_puzzle))
+
+    @property
+    def basicsudoku(self):
+        """Returns a new basicsudoku representation of the Sudoku, as those boards are mutable."""
+        return basicsudoku.SudokuBoard(symbols=self.basicsudoku_symbols)
+
+    @property
+    def sudokuwiki_difficulty(self) -> typing.Tuple[str, int]:
+        """Get the difficulty that sudokuwiki gives this Sudoku."""
+        if self.solved is True:
+            return "The provided Sudoku could not be graded", 0
+        return grade_sudokuwiki(self.sudokuwiki)
+
+    def rot90(self):
+        """Return the puzzle rotated by 90 degrees."""
+        return FrozenPuzzle(self.x, np.rot90(self.puzzle), self.solved, self.bin_values, self.bin_to_remove)
+
+    def thaw(self):
+        """Return a mutable, loaded `Puzzle` with the same values."""
+        p = Puzzle(x=self.x, bin_values=self.bin_values, bin_to_remove=self.bin_to_remove)
+        p.puzzle = self.puzzle.copy()
+        p.loaded = True
+        p.solved = self.solved
+        return p
+
+
+def record_sizes(x: int) -> typing.Tuple[int, int]:
+    """Return the byte lengths of the values and of the cells to remove, for one puzzle of size `x`."""
+    i2 = x - 1
+    to_read1 = (((i2 * i2) * 4) + 4) // 8
+    to_read2 = (x * x + 7) // 8
+    return to_read1, to_read2
+
 
-def load_file(fn, load_as_solved=False):
-    """Load puzzles from an .adkb file."""
-    lst: typing.List[Puzzle] = list()
+def load_file(fn, load_as_solved=False, frozen=False):
+    """Load puzzles from an .adkb file, as `FrozenPuzzle` objects if `frozen` is set."""
+    lst: typing.List[typing.Union[Puzzle, FrozenPuzzle]] = list()
     with open(fn, "rb") as f:
         start = f.read(1)
         mid = f.read(1)
@@ -239,18 +381,15 @@ def load_file(fn, load_as_solved=False):
         # below is unimportant, related to Sudoku type, always 0 in this case
         _ = int.from_bytes(mid, byteorder="big")
         readshort = int.from_bytes(end, byteorder="big")
+        to_read1, to_read2 = record_sizes(readbyte)
         for _ in range(readshort):
             p = Puzzle(x=readbyte)
-            i2 = readbyte - 1
-            to_read1 = (((i2 * i2) * 4) + 4) // 8
             bytes1 = f.read(to_read1)
-            i3 = readbyte * readbyte
-            to_read2 = (i3 + 7) // 8
             bytes2 = f.read(to_read2)
             p.bin_values = bytes1
             p.bin_to_remove = bytes2
             p.load_puzzle(load_as_solved=load_as_solved)
-            lst.append(p)
+            lst.append(p.freeze() if frozen else p)
     return lst
 
 
@@ -0,0 +1,91 @@
+"""Packed givens masks, for workloads that only need to know which cells a puzzle shows."""
+import typing
+
+import numpy as np
+
+from app.decode_sudoku import record_sizes
+
+# Number of set bits of every byte value.
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class GivensMask:
+    """The givens of N puzzles as an (N, bytes) uint8 bitset, laid out exactly like `Puzzle.bin_to_remove`.
+
+    Bit 7 of the first byte is the top left cell and a set bit marks a given; the padding bits after the last cell
+    are always clear, so that masks can be compared and combined bytewise.
+
+    """
+
+    def __init__(self, packed, cells: int = 81):
+        """Initialize."""
+        packed = np.asarray(packed, dtype=np.uint8).reshape(-1, (cells + 7) // 8)
+        padding = (1 << (-cells % 8)) - 1
+        if padding and (packed[:, -1] & padding).any():
+            packed = packed.copy()
+            packed[:, -1] &= ~np.uint8(padding)
+        self.packed = packed
+        self.cells = cells
+
+    def __len__(self):
+        """Return the number of masks."""
+        return len(self.packed)
+
+    def __getitem__(self, index):
+        """Return the masks selected by an index, slice or boolean array, as a GivensMask."""
+        return GivensMask(self.packed[index], self.cells)
+
+    def __eq__(self, other):
+        """Return True if both hold the same masks."""
+        return isinstance(other, GivensMask) and self.cells == other.cells and np.array_equal(self.packed, other.packed)
+
+    def __and__(self, other):
+        """Return the cells given in both, per mask, broadcasting a single mask over many."""
+        return GivensMask(self.packed & other.packed, self.cells)
+
+    def __or__(self, other):
+        """Return the cells given in either, per mask, broadcasting a single mask over many."""
+        return GivensMask(self.packed | other.packed, self.cells)
+
+    @classmethod
+    def from_bytes(cls, masks: typing.Iterable[bytes], cells: int = 81):
+        """Pack the `bin_to_remove` bytes of several puzzles."""
+        return cls(np.frombuffer(b"".join(masks), dtype=np.uint8), cells)
+
+    @classmethod
+    def from_bool(cls, mask):
+        """Pack an (N, cells) boolean array, True for the givens; (N, x, x) grids are flattened first."""
+        mask = np.asarray(mask, dtype=bool)
+        mask = mask.reshape(len(mask), -1)
+        return cls(np.packbits(mask, axis=1), mask.shape[1])
+
+    def to_bool(self):
+        """Unpack into an (N, cells) boolean array, True for the givens."""
+        return np.unpackbits(self.packed, axis=1, count=self.cells).astype(bool)
+
+    def popcount(self):
+        """Return the number of givens of every mask."""
+        return POPCOUNT[self.packed].sum(axis=1, dtype=np.int32)
+
+    def intersection(self):
+        """Return the single mask of cells given in every mask."""
+        return GivensMask(np.bitwise_and.reduce(self.packed, axis=0), self.cells)
+
+    def union(self):
+        """Return the single mask of cells given in any mask."""
+        return GivensMask(np.bitwise_or.reduce(self.packed, axis=0), self.cells)
+
+    def contains(self, pattern: "GivensMask"):
+        """Return a boolean array that is True for the masks in which every cell of `pattern` is given."""
+        return ((self.packed & pattern.packed) == pattern.packed).all(axis=1)
+
+
+def load_masks(fn) -> GivensMask:
+    """Read the givens masks of every puzzle in an .adkb file, without decoding any values."""
+    with open(fn, "rb") as f:
+        data = f.read()
+    x = data[0]
+    count = int.from_bytes(data[2:4], byteorder="big")
+    values_size, mask_size = record_sizes(x)
+    records = np.frombuffer(data, dtype=np.uint8, count=count * (values_size + mask_size), offset=4)
+    return GivensMask(records.reshape(count, values_size + mask_size)[:, values_size:], x * x)
@@ -0,0 +1,90 @@
+"""Load test the puzzle service over keep-alive connections and report latency percentiles."""
+import argparse
+import asyncio
+import json
+import time
+import typing
+
+import numpy as np
+
+from app.corpus import load_corpus
+from app.decode_sudoku import Difficulty
+from app.server import start_server
+
+PATHS = [f"/puzzles/{d.value}/random" for d in Difficulty]
+
+
+async def fetch(reader, writer, host: str, path: str) -> typing.Tuple[int, typing.Any]:
+    """Send a GET request on an open connection and return the (status, JSON payload) answer."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host: str, port: int, requests: int, latencies: typing.List[float], errors: typing.List[int]):
+    """Issue `requests` sequential requests over a single connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            status, _ = await fetch(reader, writer, host, PATHS[i % len(PATHS)])
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host: str, port: int, connections: int, requests: int, serve: bool = False) -> typing.Dict[str, float]:
+    """Run the load test and return its summary, starting an in-process server first if `serve` is set."""
+    server = None
+    if serve:
+        server = await start_server(load_corpus(), host, port)
+        port = server.sockets[0].getsockname()[1]
+    latencies: typing.List[float] = list()
+    errors: typing.List[int] = list()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[client(host, port, requests, latencies, errors) for _ in range(connections)])
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+    }
+
+
+def main(argv=None):  # pragma: no cover
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per connection.")
+    parser.add_argument("--serve", action="store_true", help="Start a server in-process on a free port.")
+    args = parser.parse_args(argv)
+    port = 0 if args.serve else args.port
+    summary = asyncio.run(run(args.host, port, args.connections, args.requests, serve=args.serve))
+    for key, value in summary.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,243 @@
+"""Local asyncio HTTP/JSON service that serves puzzles from a preloaded corpus.
+
+Routes:
+
+* ``GET /difficulties`` - puzzle count per difficulty.
+* ``GET /puzzles/{difficulty}/random`` - a random unsolved puzzle.
+* ``GET /puzzles/{difficulty}/{index}`` - an unsolved puzzle.
+* ``GET /puzzles/{difficulty}/{index}/solution`` - its solution.
+* ``GET /puzzles/{difficulty}/{index}/grade`` - its clue count, and how far naked and hidden singles get on it.
+* ``POST /validate`` - validate ``{"board": ...}``, optionally against ``"difficulty"`` and ``"index"``.
+* ``POST /batch`` - run ``{"requests": [{"method": ..., "path": ..., "body": ...}, ...]}`` in one round trip.
+
+``{difficulty}`` is either the `Difficulty` name or its number. Connections are kept alive as per HTTP/1.1.
+
+"""
+import argparse
+import asyncio
+import json
+import typing
+import urllib.parse
+
+from app.corpus import Corpus, check_board, from_flat, load_corpus, to_flat
+from app.decode_sudoku import Difficulty
+from app.stats import solve_singles
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """Raised by a route to answer with an error status."""
+
+    def __init__(self, status: int, message: str):
+        """Initialize."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def parse_difficulty(value: str) -> Difficulty:
+    """Resolve a difficulty given by name or number."""
+    try:
+        if value.isdecimal():
+            return Difficulty(int(value))
+        return Difficulty[value]
+    except (KeyError, ValueError):
+        raise HTTPError(404, f"Unknown difficulty {value}")
+
+
+class PuzzleService:
+    """Route requests against a `Corpus`; independent of the transport so that batches can reuse it."""
+
+    def __init__(self, corpus: Corpus, rng=None):
+        """Initialize."""
+        self.corpus = corpus
+        self.rng = rng
+
+    def handle(self, method: str, target: str, body: bytes = b"") -> typing.Tuple[int, typing.Any]:
+        """Return the (status, JSON payload) answer to a request."""
+        try:
+            return 200, self._route(method, target, body)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except Exception:
+            return 500, {"error": "The request could not be answered"}
+
+    def _route(self, method, target, body):
+        parts = [p for p in urllib.parse.urlsplit(target).path.split("/") if p]
+        if method == "POST":
+            data = _decode_json(body)
+            if parts == ["validate"]:
+                return self.validate(data)
+            if parts == ["batch"]:
+                return self.batch(data)
+        elif method == "GET":
+            if parts == ["difficulties"]:
+                return {d.name: self.corpus.count(d) for d in self.corpus.offsets}
+            if len(parts) in (3, 4) and parts[0] == "puzzles":
+                return self.puzzle(*parts[1:])
+        else:
+            raise HTTPError(405, f"Method {method} is not supported")
+        raise HTTPError(404, f"No route for {method} {target}")
+
+    def puzzle(self, difficulty: str, index: str, view: str = "puzzle"):
+        """Return one puzzle, its solution or its grade."""
+        d = parse_difficulty(difficulty)
+        if index == "random" and view == "puzzle":
+            try:
+                i = self.corpus.random_index(d, self.rng)
+            except IndexError as e:
+                raise HTTPError(404, str(e))
+        elif index.isdecimal():
+            i = int(index)
+        else:
+            raise HTTPError(404, f"Bad puzzle index {index}")
+        payload: typing.Dict[str, typing.Any] = {"difficulty": d.name, "index": i}
+        try:
+            if view == "puzzle":
+                payload["puzzle"] = to_flat(self.corpus.puzzle(d, i))
+            elif view == "solution":
+                payload["solution"] = to_flat(self.corpus.solution(d, i))
+            elif view == "grade":
+                filled, rounds = solve_singles(self.corpus.puzzle(d, i)[None])
+                cells_left = int((filled == 0).sum())
+                payload["clues"] = self.corpus.clues(d, i)
+                payload["singles_rounds"] = int(rounds[0])
+                payload["cells_left_after_singles"] = cells_left
+                payload["solved_by_singles"] = cells_left == 0
+            else:
+                raise HTTPError(404, f"Unknown view {view}")
+        except IndexError as e:
+            raise HTTPError(404, str(e))
+        return payload
+
+    def validate(self, data):
+        """Validate a submitted board, and compare it to a corpus puzzle if one is named."""
+        if not isinstance(data, dict) or not isinstance(data.get("board"), str):
+            raise HTTPError(400, "Expected a JSON object with an 81 character 'board'")
+        try:
+            cells = from_flat(data["board"])
+        except ValueError:
+            raise HTTPError(400, "Expected a JSON object with an 81 character 'board'")
+        valid, complete = check_board(cells)
+        payload = {"valid": valid, "complete": complete}
+        if "difficulty" in data and "index" in data:
+            index = data["index"]
+            if not isinstance(index, int) or isinstance(index, bool):
+                raise HTTPError(400, "Expected 'index' to be an integer")
+            d = parse_difficulty(str(data["difficulty"]))
+            try:
+                row = self.corpus.row(d, index)
+            except IndexError as e:
+                raise HTTPError(404, str(e))
+            solution = self.corpus.solutions[row]
+            givens = self.corpus.givens[row]
+            filled = cells != 0
+            payload["keeps_givens"] = bool((cells[givens] == solution[givens]).all())
+            payload["correct"] = bool((cells[filled] == solution[filled]).all())
+            payload["solved"] = complete and payload["correct"]
+        return payload
+
+    def batch(self, data):
+        """Answer several requests at once."""
+        if not isinstance(data, dict) or not isinstance(data.get("requests"), list):
+            raise HTTPError(400, "Expected a JSON object with a 'requests' list")
+        responses = list()
+        for each in data["requests"]:
+            if not isinstance(each, dict) or not isinstance(each.get("path"), str):
+                responses.append({"status": 400, "body": {"error": "Each request needs a 'path' string"}})
+                continue
+            method = each.get("method", "GET")
+            if not isinstance(method, str):
+                responses.append({"status": 400, "body": {"error": "A request 'method' must be a string"}})
+                continue
+            sub_body = json.dumps(each["body"]).encode() if "body" in each else b""
+            status, payload = self.handle(method.upper(), each["path"], sub_body)
+            responses.append({"status": status, "body": payload})
+        return {"responses": responses}
+
+
+def _decode_json(body: bytes):
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise HTTPError(400, "The request body is not valid JSON")
+
+
+def encode_response(status: int, payload, keep_alive: bool) -> bytes:
+    """Serialize an HTTP/1.1 response with a JSON body."""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def serve_connection(service: PuzzleService, reader, writer):
+    """Answer requests on one connection until the client closes it or asks to."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, version = request_line.decode("latin-1").split()
+            except ValueError:
+                writer.write(encode_response(400, {"error": "Malformed request line"}, keep_alive=False))
+                break
+            headers = dict()
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip().lower()
+            length = int(headers.get("content-length", "0") or 0)
+            body = await reader.readexactly(length) if length else b""
+            connection = headers.get("connection", "")
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+            status, payload = service.handle(method.upper(), target, body)
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(corpus: Corpus, host="127.0.0.1", port=8080):
+    """Start serving `corpus` and return the asyncio server."""
+    service = PuzzleService(corpus)
+    return await asyncio.start_server(lambda r, w: serve_connection(service, r, w), host, port)
+
+
+def main(argv=None):  # pragma: no cover
+    """Run the service until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--files", default="files/", help="Directory holding the .adkb files.")
+    parser.add_argument("--cache", help="Directory to memory-map the decoded corpus from, shared between processes.")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.files, args.cache)
+
+    async def run():
+        server = await start_server(corpus, args.host, args.port)
+        print(f"Serving {len(corpus)} puzzles on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,170 @@
+"""Per-difficulty corpus statistics, computed in whole-corpus array passes."""
+import argparse
+import json
+import typing
+
+import numpy as np
+
+from app.corpus import CELLS, Corpus, load_corpus
+
+DIGITS = np.arange(1, 10, dtype=np.int8)
+
+# Transformations of a (N, 9, 9) givens mask, checked in this order to name its symmetry class.
+SYMMETRIES: typing.Dict[str, typing.Callable] = {
+    "rot180": lambda m: m[:, ::-1, ::-1],
+    "rot90": lambda m: np.rot90(m, axes=(1, 2)),
+    "horizontal": lambda m: m[:, :, ::-1],
+    "vertical": lambda m: m[:, ::-1, :],
+    "diagonal": lambda m: m.transpose(0, 2, 1),
+    "antidiagonal": lambda m: m[:, ::-1, ::-1].transpose(0, 2, 1),
+}
+
+
+def unit_cells():
+    """Return the (27, 9) cell indices of every row, column and box."""
+    cells = np.arange(CELLS).reshape(9, 9)
+    boxes = cells.reshape(3, 3, 3, 3).swapaxes(1, 2).reshape(9, 9)
+    return np.concatenate([cells, cells.T, boxes])
+
+
+# Digit of each single-bit candidate mask, bit d standing for digit d.
+BIT_DIGITS = np.zeros(1 << 10, dtype=np.int8)
+BIT_DIGITS[1 << DIGITS.astype(np.int64)] = DIGITS
+
+
+def solve_singles(grids) -> typing.Tuple[typing.Any, typing.Any]:
+    """Fill in naked and hidden singles for every puzzle at once, until no puzzle makes progress.
+
+    `grids` is an (N, 81) array with 0 for unknown cells. Returns the filled grids and the number of rounds each
+    puzzle progressed in; a round places every single that is visible at its start.
+
+    """
+    units = unit_cells()
+    # The three units of every cell, in row, column, box order.
+    cell_units = np.argsort(units.ravel(), kind="stable").reshape(CELLS, 3) // 9
+    # Work cell-major, (81, N), with candidates as bit masks, so each pass is a few whole-array operations.
+    cells = np.array(grids, dtype=np.int8).T.copy()
+    rounds = np.zeros(cells.shape[1], dtype=np.int32)
+    active = np.arange(cells.shape[1])
+    while len(active):
+        sub = cells[:, active]
+        placed = np.left_shift(np.uint16(1), sub.astype(np.uint16))
+        seen = np.bitwise_or.reduce(placed[units], axis=1)
+        blocked = np.bitwise_or.reduce(seen[cell_units], axis=1)
+        candidates = np.where(sub == 0, ~blocked & 0x3FE, 0).astype(np.uint16)
+        once = np.zeros_like(seen)
+        twice = np.zeros_like(seen)
+        for member in candidates[units].transpose(1, 0, 2):
+            twice |= once & member
+            once |= member
+        hidden = candidates & np.bitwise_or.reduce((once & ~twice)[cell_units], axis=1)
+        naked = (candidates & (candidates - 1)) == 0
+        found = np.where(naked, candidates, hidden & -hidden)
+        filled = found != 0
+        sub[filled] = BIT_DIGITS[found[filled]]
+        cells[:, active] = sub
+        progressed = filled.any(axis=0)
+        rounds[active[progressed]] += 1
+        active = active[progressed]
+    return cells.T, rounds
+
+
+def symmetry_codes(masks):
+    """Return, per (N, 81) givens mask, a bit field with bit i set if it has the i-th of `SYMMETRIES`."""
+    grid = np.asarray(masks).reshape(-1, 9, 9)
+    codes = np.zeros(len(grid), dtype=np.int32)
+    for bit, transform in enumerate(SYMMETRIES.values()):
+        codes |= (grid == transform(grid)).all(axis=(1, 2)).astype(np.int32) << bit
+    return codes
+
+
+def symmetry_name(code: int) -> str:
+    """Return the name of a symmetry class from its bit field."""
+    names = [name for bit, name in enumerate(SYMMETRIES) if code >> bit & 1]
+    return "+".join(names) or "none"
+
+
+def _summary(values) -> typing.Dict[str, typing.Any]:
+    counts = np.bincount(values)
+    return {
+        "min": int(values.min()),
+        "max": int(values.max()),
+        "mean": float(values.mean()),
+        "histogram": {int(v): int(counts[v]) for v in np.flatnonzero(counts)},
+    }
+
+
+def compute(corpus: Corpus) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """Compute the statistics of every difficulty in the corpus, keyed by difficulty name."""
+    givens = np.asarray(corpus.givens, dtype=bool)
+    solutions = np.asarray(corpus.solutions)
+    grid = givens.reshape(-1, 9, 9)
+    clues = givens.sum(axis=1)
+    per_row = grid.sum(axis=2)
+    per_box = grid.reshape(-1, 3, 3, 3, 3).sum(axis=(2, 4)).reshape(-1, 9)
+    digits = (np.where(givens, solutions, 0)[:, :, None] == DIGITS).sum(axis=1)
+    symmetry = symmetry_codes(givens)
+    filled, rounds = solve_singles(np.where(givens, solutions, 0))
+    remaining = (filled == 0).sum(axis=1)
+
+    report = dict()
+    for difficulty, (start, stop) in corpus.offsets.items():
+        rows = slice(start, stop)
+        codes, counts = np.unique(symmetry[rows], return_counts=True)
+        report[difficulty.name] = {
+            "puzzles": stop - start,
+            "clues": _summary(clues[rows]),
+            "givens_per_row": {
+                "mean": per_row[rows].mean(axis=0).tolist(),
+                "histogram": np.bincount(per_row[rows].ravel(), minlength=10).tolist(),
+            },
+            "givens_per_box": {
+                "mean": per_box[rows].mean(axis=0).tolist(),
+                "histogram": np.bincount(per_box[rows].ravel(), minlength=10).tolist(),
+            },
+            "digit_frequency": digits[rows].sum(axis=0).tolist(),
+            "symmetry": {name: int((symmetry[rows] >> bit & 1).sum()) for bit, name in enumerate(SYMMETRIES)},
+            "symmetry_classes": {symmetry_name(c): int(n) for c, n in zip(codes, counts)},
+            "singles": {
+                "solved": int((remaining[rows] == 0).sum()),
+                "rounds": _summary(rounds[rows]),
+                "remaining": _summary(remaining[rows]),
+            },
+        }
+    return report
+
+
+def format_report(report: typing.Dict[str, typing.Dict[str, typing.Any]]) -> str:
+    """Return a human readable version of `compute` output."""
+    lines = list()
+    for name, s in report.items():
+        singles = s["singles"]
+        lines.append(f"{name} ({s['puzzles']} puzzles)")
+        lines.append(f"  clues: min {s['clues']['min']}, mean {s['clues']['mean']:.2f}, max {s['clues']['max']}")
+        lines.append("  givens per row: " + " ".join(f"{v:.2f}" for v in s["givens_per_row"]["mean"]))
+        lines.append("  givens per box: " + " ".join(f"{v:.2f}" for v in s["givens_per_box"]["mean"]))
+        lines.append("  digit frequency: " + " ".join(f"{d}:{n}" for d, n in enumerate(s["digit_frequency"], 1)))
+        lines.append("  symmetry classes: " + ", ".join(f"{c} {n}" for c, n in s["symmetry_classes"].items()))
+        lines.append(
+            f"  singles: {singles['solved']} solved, "
+            f"mean {singles['rounds']['mean']:.2f} rounds, "
+            f"mean {singles['remaining']['mean']:.2f} cells left"
+        )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main(argv=None):  # pragma: no cover
+    """Print the statistics report, or its JSON with --json."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", default="files/", help="Directory holding the .adkb files.")
+    parser.add_argument("--cache", help="Directory to memory-map the decoded corpus from.")
+    parser.add_argument("--json", action="store_true", help="Emit machine readable JSON.")
+    args = parser.parse_args(argv)
+
+    report = compute(load_corpus(args.files, args.cache))
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -2,7 +2,8 @@
 import pytest
 from responses import RequestsMock
 
-from app.decode_sudoku import Puzzle
+from app.corpus import Corpus
+from app.decode_sudoku import Difficulty, Puzzle
 
 
 @pytest.fixture
@@ -205,6 +206,12 @@ def sudoku_solved(cell_bin_values, cell_bin_to_remove):
     return puz
 
 
+@pytest.fixture(scope="function")
+def sudoku_frozen(sudoku_unsolved):
+    """Return a frozen unsolved Sudoku."""
+    return sudoku_unsolved.freeze()
+
+
 @pytest.fixture(scope="function")
 def sudoku_unloaded(cell_bin_values, cell_bin_to_remove):
     """Get an unloaded Sudoku."""
@@ -220,3 +227,9 @@ def responses():
     """Set up the responses mock."""
     with RequestsMock(assert_all_requests_are_fired=True) as resp:
         yield resp
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """Return a corpus of the two easiest difficulty files."""
+    return Corpus.from_files("files/", difficulties=[Difficulty.Very_Easy, Difficulty.Easy])
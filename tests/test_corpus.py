@@ -0,0 +1,161 @@
+"""Corpus tests."""
+import numpy as np
+import pytest
+
+from app.corpus import Corpus, check_board, from_flat, load_corpus, rows_from_arrow, to_flat
+from app.decode_sudoku import Difficulty, load_file
+
+
+def test_corpus_matches_load_file(corpus, sudoku_filename):
+    """Verify that the corpus holds the same puzzles as load_file."""
+    assert len(corpus) == 2000
+    assert corpus.count(Difficulty.Very_Easy) == 1000
+    assert corpus.count(Difficulty.Hard) == 0
+    unsolved = load_file(sudoku_filename)
+    solved = load_file(sudoku_filename, load_as_solved=True)
+    for index in (0, 1, 999):
+        assert to_flat(corpus.puzzle(Difficulty.Very_Easy, index)) == unsolved[index].flat_puzzle
+        assert to_flat(corpus.solution(Difficulty.Very_Easy, index)) == solved[index].flat_puzzle
+    with pytest.raises(IndexError):
+        corpus.row(Difficulty.Very_Easy, 1000)
+
+
+def test_corpus_save_load_mmap(corpus, tmp_path):
+    """Test that a saved corpus is memory-mapped read-only on load."""
+    corpus.save(str(tmp_path))
+    loaded = Corpus.load(str(tmp_path), mmap=True)
+    assert isinstance(loaded.solutions, np.memmap)
+    assert not loaded.solutions.flags.writeable
+    assert loaded.offsets == corpus.offsets
+    assert (loaded.solutions == corpus.solutions).all()
+    assert (loaded.givens == corpus.givens).all()
+    assert isinstance(loaded.puzzles, np.memmap)
+    assert not loaded.puzzles.flags.writeable
+    assert (loaded.puzzles == corpus.puzzles).all()
+    assert np.shares_memory(np.asarray(loaded), loaded.puzzles)
+    assert np.shares_memory(np.asarray(loaded.memoryview()), loaded.puzzles)
+
+
+def test_load_corpus_cache(corpus, tmp_path, monkeypatch):
+    """Test that the cache is built once, renamed into place whole, and reused."""
+    monkeypatch.setattr(Corpus, "from_files", classmethod(lambda cls, path: corpus))
+    cache = str(tmp_path / "cache")
+    loaded = load_corpus(cache=cache)
+    assert isinstance(loaded.solutions, np.memmap)
+    assert [p.name for p in tmp_path.iterdir()] == ["cache"]
+
+    def rebuild(cls, path):
+        raise AssertionError("The cache should not be rebuilt")
+
+    monkeypatch.setattr(Corpus, "from_files", classmethod(rebuild))
+    assert (load_corpus(cache=cache).solutions == corpus.solutions).all()
+
+
+def test_load_corpus_stale_cache(corpus, tmp_path, monkeypatch):
+    """Test that a cache missing one of the arrays is rebuilt."""
+    monkeypatch.setattr(Corpus, "from_files", classmethod(lambda cls, path: corpus))
+    cache = tmp_path / "cache"
+    corpus.save(str(cache))
+    (cache / "puzzles.npy").unlink()
+    loaded = load_corpus(cache=str(cache))
+    assert (loaded.puzzles == corpus.puzzles).all()
+    assert (cache / "puzzles.npy").exists()
+    assert [p.name for p in tmp_path.iterdir()] == ["cache"]
+
+
+def test_load_without_mmap_read_only(corpus, tmp_path):
+    """Test that the unsolved puzzles are read-only however the corpus is loaded."""
+    corpus.save(str(tmp_path))
+    loaded = Corpus.load(str(tmp_path), mmap=False)
+    assert not isinstance(loaded.puzzles, np.memmap)
+    assert not np.asarray(loaded).flags.writeable
+    assert loaded.memoryview().readonly
+    assert memoryview(np.asarray(loaded)).readonly
+
+
+def test_load_corpus_lost_race(corpus, tmp_path, monkeypatch):
+    """Test that a process whose cache was beaten into place uses the winner's."""
+    cache = tmp_path / "cache"
+
+    def from_files(cls, path):
+        corpus.save(str(cache))  # another process finishes first
+        return corpus
+
+    monkeypatch.setattr(Corpus, "from_files", classmethod(from_files))
+    assert (load_corpus(cache=str(cache)).givens == corpus.givens).all()
+    assert [p.name for p in tmp_path.iterdir()] == ["cache"]
+
+
+def test_check_board(sudoku_unsolved, sudoku_solved):
+    """Test board validation."""
+    assert check_board(from_flat(sudoku_unsolved.flat_puzzle)) == (True, False)
+    assert check_board(from_flat(sudoku_solved.flat_puzzle)) == (True, True)
+    assert check_board(from_flat("11" + "." * 79)) == (False, False)
+    with pytest.raises(ValueError):
+        from_flat("1" * 80)
+    with pytest.raises(ValueError):
+        from_flat("x" * 81)
+
+
+def test_zero_copy_views(corpus):
+    """Test that NumPy and buffer consumers read the corpus memory without copying it."""
+    rows = np.asarray(corpus)
+    assert rows.shape == (2000, 81)
+    assert np.shares_memory(rows, corpus.puzzles)
+    assert not rows.flags.writeable
+    assert to_flat(rows[1000]) == to_flat(corpus.puzzle(Difficulty.Easy, 0))
+    view = corpus.memoryview()
+    assert view.readonly
+    assert view.shape == (2000, 81)
+    assert np.shares_memory(np.asarray(view), corpus.puzzles)
+    assert np.shares_memory(np.asarray(corpus.memoryview(solved=True)), corpus.solutions)
+    assert corpus.memoryview(solved=True).readonly
+    assert corpus.solutions.flags.writeable
+    assert np.shares_memory(np.asarray(corpus.__buffer__(0)), corpus.puzzles)
+
+
+def test_arrow_round_trip(corpus, tmp_path):
+    """Test that Arrow views of the corpus, and arrays read back from them, share its memory."""
+    pa = pytest.importorskip("pyarrow")
+    as_list = corpus.to_arrow()
+    assert as_list.type == pa.list_(pa.int8(), 81)
+    assert len(as_list) == 2000
+    as_binary = corpus.to_arrow(binary=True)
+    assert as_binary.type == pa.binary(81)
+    back = rows_from_arrow(as_list)
+    assert np.shares_memory(back, corpus.puzzles)
+    assert (back == corpus.puzzles).all()
+    back = rows_from_arrow(as_binary[5:9])
+    assert np.shares_memory(back, corpus.puzzles)
+    assert (back == corpus.puzzles[5:9]).all()
+    back = rows_from_arrow(corpus.to_arrow(solved=True)[3:7])
+    assert np.shares_memory(back, corpus.solutions)
+    assert (back == corpus.solutions[3:7]).all()
+    assert as_list[0].values.to_pylist() == corpus.puzzles[0].tolist()
+
+    corpus.save(str(tmp_path))
+    mapped = Corpus.load(str(tmp_path), mmap=True)
+    assert np.shares_memory(rows_from_arrow(mapped.to_arrow(solved=True)), mapped.solutions)
+    assert np.shares_memory(rows_from_arrow(mapped.to_arrow()), mapped.puzzles)
+    assert np.shares_memory(rows_from_arrow(mapped.to_arrow(binary=True)), mapped.puzzles)
+
+
+def test_rows_from_arrow_rejects(corpus):
+    """Test that Arrow arrays that are not puzzle rows are refused rather than misread."""
+    pa = pytest.importorskip("pyarrow")
+    with pytest.raises(TypeError):
+        rows_from_arrow(pa.array([1, 2, 3], type=pa.int8()))
+    wide = pa.FixedSizeListArray.from_arrays(pa.array(corpus.puzzles[0].astype(np.int32)), 81)
+    with pytest.raises(TypeError):
+        rows_from_arrow(wide)
+    short = pa.FixedSizeListArray.from_arrays(pa.array(corpus.puzzles[0]), 27)
+    with pytest.raises(TypeError):
+        rows_from_arrow(short)
+    with pytest.raises(TypeError):
+        rows_from_arrow(pa.array([b"\x00" * 27], type=pa.binary(27)))
+    with pytest.raises(ValueError):
+        rows_from_arrow(pa.array([None], type=pa.binary(81)))
+    cells = corpus.puzzles[0].tolist()
+    cells[3] = None
+    with pytest.raises(ValueError):
+        rows_from_arrow(pa.FixedSizeListArray.from_arrays(pa.array(cells, type=pa.int8()), 81))
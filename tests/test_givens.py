@@ -0,0 +1,43 @@
+"""Givens mask tests."""
+import numpy as np
+
+from app.decode_sudoku import load_file
+from app.givens import GivensMask, load_masks
+
+
+def test_load_masks(sudoku_filename):
+    """Verify that masks read straight from the file match the decoded puzzles."""
+    masks = load_masks(sudoku_filename)
+    puzzles = load_file(sudoku_filename)
+    assert len(masks) == 1000
+    assert masks == GivensMask.from_bytes([p.bin_to_remove for p in puzzles])
+    expected = np.array([p.puzzle.ravel() != 0 for p in puzzles])
+    assert (masks.to_bool() == expected).all()
+    assert (masks.popcount() == expected.sum(axis=1)).all()
+    assert masks == GivensMask.from_bool(expected)
+    grids = GivensMask.from_bool(expected.reshape(-1, 9, 9))
+    assert grids == masks
+    assert grids.cells == 81
+
+
+def test_mask_operations(cell_bin_to_remove, cell_bin_to_remove_decoded):
+    """Test combining and matching masks."""
+    mask = GivensMask.from_bytes([cell_bin_to_remove])
+    assert mask.to_bool()[0].tolist() == cell_bin_to_remove_decoded
+    corner = np.zeros((1, 81), dtype=bool)
+    corner[0, 0] = True
+    other = np.zeros((1, 81), dtype=bool)
+    other[0, 3] = True
+    masks = GivensMask.from_bool(np.concatenate([corner, other]))
+    assert masks.popcount().tolist() == [1, 1]
+    assert masks.union().popcount().tolist() == [2]
+    assert masks.intersection().popcount().tolist() == [0]
+    assert (masks & mask).popcount().tolist() == [1, 0]
+    assert (masks | mask).popcount().tolist() == [mask.popcount()[0], mask.popcount()[0] + 1]
+    assert mask.contains(masks[:1]).tolist() == [True]
+    assert mask.contains(masks[1:]).tolist() == [False]
+
+
+def test_padding_cleared():
+    """Test that bits past the last cell are ignored."""
+    assert GivensMask.from_bytes([b"\x00" * 10 + b"\xff"]) == GivensMask.from_bytes([b"\x00" * 10 + b"\x80"])
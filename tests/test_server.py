@@ -0,0 +1,130 @@
+"""Puzzle service tests."""
+import asyncio
+import json
+
+import pytest
+
+from app.corpus import to_flat
+from app.decode_sudoku import Difficulty
+from app.load_test import fetch
+from app.server import PuzzleService, start_server
+
+
+@pytest.fixture
+def service(corpus):
+    """Return a service over the test corpus."""
+    return PuzzleService(corpus)
+
+
+def test_puzzle_routes(service, corpus):
+    """Verify the puzzle, solution and grade routes."""
+    status, payload = service.handle("GET", "/puzzles/Very_Easy/3")
+    assert status == 200
+    assert payload == {"difficulty": "Very_Easy", "index": 3, "puzzle": to_flat(corpus.puzzle(Difficulty.Very_Easy, 3))}
+    status, payload = service.handle("GET", "/puzzles/2/3/solution")
+    assert payload["solution"] == to_flat(corpus.solution(Difficulty.Easy, 3))
+    status, payload = service.handle("GET", "/puzzles/2/3/grade")
+    assert payload["clues"] == corpus.clues(Difficulty.Easy, 3)
+    assert payload["singles_rounds"] > 0
+    assert payload["cells_left_after_singles"] == 0
+    assert payload["solved_by_singles"] is True
+    status, payload = service.handle("GET", "/puzzles/1/random")
+    assert status == 200
+    assert 0 <= payload["index"] < 1000
+    assert service.handle("GET", "/difficulties") == (200, {"Very_Easy": 1000, "Easy": 1000})
+
+
+def test_errors(service):
+    """Test that bad requests are answered with error statuses."""
+    assert service.handle("GET", "/puzzles/Impossible/1")[0] == 404
+    assert service.handle("GET", "/puzzles/1/1000")[0] == 404
+    assert service.handle("GET", "/puzzles/9/random")[0] == 404
+    assert service.handle("GET", "/puzzles/1/\u00b2")[0] == 404
+    assert service.handle("GET", "/puzzles/\u00b2/1")[0] == 404
+    assert service.handle("GET", "/nowhere")[0] == 404
+    assert service.handle("DELETE", "/puzzles/1/1")[0] == 405
+    assert service.handle("POST", "/validate", b"{")[0] == 400
+    assert service.handle("POST", "/validate", b'{"board": "1"}')[0] == 400
+
+
+def test_validate(service, corpus):
+    """Test validating boards against the corpus."""
+    puzzle = to_flat(corpus.puzzle(Difficulty.Very_Easy, 0))
+    solution = to_flat(corpus.solution(Difficulty.Very_Easy, 0))
+    body = json.dumps({"board": puzzle, "difficulty": "Very_Easy", "index": 0}).encode()
+    status, payload = service.handle("POST", "/validate", body)
+    assert payload == {"valid": True, "complete": False, "keeps_givens": True, "correct": True, "solved": False}
+    body = json.dumps({"board": solution, "difficulty": 1, "index": 0}).encode()
+    assert service.handle("POST", "/validate", body)[1]["solved"] is True
+    status, payload = service.handle("POST", "/validate", json.dumps({"board": "1" * 81}).encode())
+    assert payload == {"valid": False, "complete": True}
+
+
+def test_validate_bad_bodies(service):
+    """Test that well-formed JSON of the wrong shape is answered with 400."""
+    board = "." * 81
+    bodies = [
+        [board],
+        {"board": [0] * 81},
+        {"board": board, "difficulty": 1, "index": None},
+        {"board": board, "difficulty": 1, "index": [1]},
+        {"board": board, "difficulty": 1, "index": 1.7},
+        {"board": board, "difficulty": 1, "index": True},
+    ]
+    for body in bodies:
+        assert service.handle("POST", "/validate", json.dumps(body).encode())[0] == 400
+    batch = {"requests": [{"method": "POST", "path": "/validate", "body": body} for body in bodies]}
+    status, payload = service.handle("POST", "/batch", json.dumps(batch).encode())
+    assert status == 200
+    assert [r["status"] for r in payload["responses"]] == [400] * len(bodies)
+    body = {"board": board, "difficulty": 1, "index": -1}
+    assert service.handle("POST", "/validate", json.dumps(body).encode())[0] == 404
+
+
+def test_unexpected_error(service, monkeypatch):
+    """Test that an unexpected error is answered with 500."""
+
+    def broken(*args):
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(service, "puzzle", broken)
+    assert service.handle("GET", "/puzzles/1/0") == (500, {"error": "The request could not be answered"})
+
+
+def test_batch(service):
+    """Test answering several requests in one."""
+    body = {
+        "requests": [
+            {"path": "/puzzles/1/0"},
+            {"method": "POST", "path": "/validate", "body": {"board": "." * 81}},
+            {"path": "/puzzles/1/5000"},
+            {},
+            {"path": 5},
+            {"method": 5, "path": "/puzzles/1/0"},
+        ]
+    }
+    status, payload = service.handle("POST", "/batch", json.dumps(body).encode())
+    assert status == 200
+    assert [r["status"] for r in payload["responses"]] == [200, 200, 404, 400, 400, 400]
+    assert payload["responses"][1]["body"] == {"valid": True, "complete": False}
+
+
+def test_keep_alive(corpus):
+    """Test that several requests are served over one connection."""
+
+    async def run():
+        server = await start_server(corpus, port=0)
+        host, port = server.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+        results = [await fetch(reader, writer, host, f"/puzzles/1/{i}") for i in range(3)]
+        writer.write(b"GET /puzzles/2/0 HTTP/1.1\r\nConnection: close\r\n\r\n")
+        closing = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return results, closing
+
+    results, closing = asyncio.run(run())
+    assert [status for status, _ in results] == [200, 200, 200]
+    assert [payload["index"] for _, payload in results] == [0, 1, 2]
+    assert b"Connection: close" in closing
@@ -1,7 +1,11 @@
 """Simple tests."""
+import concurrent.futures
 import copy
+import pickle
 
-from app.decode_sudoku import CellTypeChecker, CellValueGetter, Puzzle, load_file
+import pytest
+
+from app.decode_sudoku import CellTypeChecker, CellValueGetter, FrozenPuzzle, Puzzle, load_file
 
 
 def test_simple():
@@ -205,3 +209,71 @@ def test_unloaded(cell_bin_values, cell_bin_to_remove):
     assert puz.flat_puzzle is not None
     assert puz.basicsudoku is not None
     assert puz.sudokuwiki is not None
+
+
+def test_frozen_forms(sudoku_unsolved, sudoku_frozen):
+    """Verify that a frozen Sudoku has the forms of the Sudoku it was frozen from."""
+    assert isinstance(sudoku_frozen, FrozenPuzzle)
+    assert sudoku_frozen.loaded
+    assert sudoku_frozen.puzzle.tolist() == sudoku_unsolved.puzzle.tolist()
+    assert sudoku_frozen.flat_puzzle == sudoku_unsolved.flat_puzzle
+    assert sudoku_frozen.sudokuwiki == sudoku_unsolved.sudokuwiki
+    assert sudoku_frozen.basicsudoku.symbols == sudoku_unsolved.basicsudoku.symbols
+    assert sudoku_frozen.basicsudoku is not sudoku_frozen.basicsudoku
+    assert str(sudoku_frozen).startswith("<FrozenPuzzle x=9 flat_puzzle=981003040")
+    assert sudoku_frozen.thaw().flat_puzzle == sudoku_unsolved.flat_puzzle
+
+
+def test_frozen_read_only(sudoku_unsolved, sudoku_frozen):
+    """Test that a frozen Sudoku cannot be changed, and is unaffected by its source."""
+    with pytest.raises(ValueError):
+        sudoku_frozen.puzzle[0][0] = 1
+    with pytest.raises(ValueError):
+        sudoku_frozen.puzzle.flags.writeable = True
+    with pytest.raises(ValueError):
+        sudoku_frozen.rot90().puzzle.flags.writeable = True
+    with pytest.raises(AttributeError):
+        sudoku_frozen.puzzle = None
+    with pytest.raises(AttributeError):
+        del sudoku_frozen.solved
+    flat = sudoku_frozen.flat_puzzle
+    sudoku_unsolved.rot90()
+    sudoku_unsolved.puzzle[0][0] = 1
+    assert sudoku_frozen.flat_puzzle == flat
+    assert copy.copy(sudoku_frozen) is sudoku_frozen
+    assert copy.deepcopy(sudoku_frozen) is sudoku_frozen
+    unpickled = pickle.loads(pickle.dumps(sudoku_frozen))
+    assert unpickled == sudoku_frozen
+    assert hash(unpickled) == hash(sudoku_frozen)
+    assert not unpickled.puzzle.flags.writeable
+
+
+def test_frozen_rotated(sudoku_frozen):
+    """Test that rotating a frozen Sudoku returns a new Sudoku."""
+    rotated = sudoku_frozen.rot90()
+    assert rotated is not sudoku_frozen
+    assert rotated != sudoku_frozen
+    assert rotated.basicsudoku.is_valid_board()
+    assert not rotated.puzzle.flags.writeable
+    assert rotated.rot90().rot90().rot90() == sudoku_frozen
+
+
+def test_frozen_shared_between_threads(sudoku_filename):
+    """Test that many threads can read the same frozen Sudokus."""
+    lst = load_file(sudoku_filename, frozen=True)
+    assert all(isinstance(x, FrozenPuzzle) for x in lst)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: [x.sudokuwiki for x in lst], range(8)))
+    assert all(r == results[0] for r in results)
+    assert all(a is b for a, b in zip(results[0], results[1]))
+
+
+def test_freeze_unloaded(sudoku_unloaded):
+    """Test that an unloaded Sudoku cannot be frozen."""
+    assert sudoku_unloaded.freeze() is None
+
+
+def test_frozen_grading_bad_request(sudoku_frozen, responses):
+    """Test that grading a frozen Sudoku goes through sudokuwiki and fails gracefully."""
+    responses.add(responses.POST, "https://www.sudokuwiki.org/ServerSolver.asp?k=0", status=500)
+    assert sudoku_frozen.sudokuwiki_difficulty == ("The request to Sudokuwiki failed", 0)
@@ -0,0 +1,50 @@
+"""Corpus statistics tests."""
+import json
+
+import numpy as np
+
+from app.stats import compute, format_report, solve_singles, symmetry_codes, symmetry_name
+
+
+def test_compute(corpus):
+    """Verify the statistics of the test corpus."""
+    report = compute(corpus)
+    assert list(report) == ["Very_Easy", "Easy"]
+    json.dumps(report)
+    for s in report.values():
+        assert s["puzzles"] == 1000
+        clue_total = sum(count * n for count, n in s["clues"]["histogram"].items())
+        assert sum(s["digit_frequency"]) == clue_total
+        assert sum(s["givens_per_row"]["histogram"]) == 9000
+        assert np.isclose(sum(s["givens_per_box"]["mean"]), s["clues"]["mean"])
+        assert sum(s["symmetry_classes"].values()) == 1000
+        assert s["singles"]["solved"] == 1000
+    assert report["Very_Easy"]["clues"]["min"] == 41
+    assert "Very_Easy (1000 puzzles)" in format_report(report)
+
+
+def test_solve_singles(corpus):
+    """Test that singles only ever place the solution's values."""
+    grids = np.where(corpus.givens, corpus.solutions, 0)
+    filled, rounds = solve_singles(grids)
+    assert ((filled == 0) | (filled == corpus.solutions)).all()
+    assert (rounds[(grids == 0).any(axis=1)] > 0).all()
+    stuck = grids.copy()
+    stuck[0] = 0
+    filled, rounds = solve_singles(stuck)
+    assert (filled[0] == 0).all()
+    assert rounds[0] == 0
+
+
+def test_symmetry():
+    """Test symmetry classification of givens masks."""
+    empty = np.zeros((1, 81), dtype=bool)
+    corner = empty.copy()
+    corner[0, 0] = True
+    opposite = corner.copy()
+    opposite[0, 80] = True
+    codes = symmetry_codes(np.concatenate([empty, corner, opposite]))
+    assert symmetry_name(codes[0]) == "rot180+rot90+horizontal+vertical+diagonal+antidiagonal"
+    assert symmetry_name(codes[1]) == "diagonal"
+    assert symmetry_name(codes[2]) == "rot180+diagonal+antidiagonal"
+    assert symmetry_name(0) == "none"